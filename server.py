@@ -1,19 +1,42 @@
 #!/usr/bin/env python3
+import atexit
+import functools
+import gzip
+import http.client
+import io
 import json
 import os
+import random
 import re
 import sqlite3
+import stat
 import threading
 import time
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
-from email.utils import parsedate_to_datetime
+from email.utils import formatdate, parsedate_to_datetime
 from http import HTTPStatus
 from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 from typing import Optional, Union
-from urllib.parse import parse_qs, quote_plus, urlencode, urlparse, unquote
-from urllib.request import Request, urlopen
-import xml.etree.ElementTree as ET
+from urllib.error import HTTPError
+from urllib.parse import parse_qs, quote_plus, urlencode, urljoin, urlparse, urlsplit, unquote
+
+try:
+    # libxml2-backed parser when available; the stdlib API is a drop-in fallback.
+    from lxml import etree as ET
+    HAS_LXML = True
+except ImportError:
+    import xml.etree.ElementTree as ET
+    HAS_LXML = False
+
+try:
+    # Encodes straight to UTF-8 bytes in C; responses fall back to the stdlib encoder without it.
+    import orjson
+except ImportError:
+    orjson = None
 
 BASE_DIR = Path(__file__).resolve().parent
 STATIC_DIR = BASE_DIR / "static"
@@ -28,15 +51,59 @@ USER_AGENT = (
     "Chrome/121.0.0.0 Safari/537.36"
 )
 
+GOOGLE_NEWS_RSS_URL = "https://news.google.com/rss/search?q={query}&hl=tr&gl=TR&ceid=TR:tr"
+GOOGLE_TRENDS_RSS_URL = "https://trends.google.com/trending/rss?geo=TR"
+TRENDS_API_URL = "https://trends.google.com/trends/api"
+
+FETCH_WORKERS = 8
+# trends.google.com rate-limits harder than the News RSS feed, so fan out less.
+TRENDS_WORKERS = 6
+HTTP_TIMEOUT = 12
+HTTP_POOL_MAXSIZE = 16
+HTTP_POOL: dict[tuple[str, str], list[http.client.HTTPConnection]] = {}
+HTTP_POOL_LOCK = threading.Lock()
+# Shared by every outbound request; Connection: keep-alive lets pooled sockets be reused.
+HTTP_HEADERS = {"User-Agent": USER_AGENT, "Connection": "keep-alive", "Accept-Encoding": "gzip, deflate"}
+HTTP_RETRY_STATUSES = (429, 500, 502, 503, 504)
+HTTP_RETRY_ATTEMPTS = 4
+HTTP_RETRY_BASE = 0.5
+HTTP_RETRY_CAP = 8.0
+
+WS_RE = re.compile(r"\s+")
+# Google Trends API prefix
+TRENDS_PREFIX_RE = re.compile(r"^\)\]\}',?\s*")
+
+HTTP_WORKERS = 16
+KEEPALIVE_TIMEOUT = 5
+# API bodies are small JSON objects; anything larger is refused rather than buffered.
+MAX_REQUEST_BODY = 65536
+WAL_CHECKPOINT_INTERVAL = 3600
+AUTO_SCAN_MIN_WAIT = 8.0
+SETTINGS_CACHE: dict[str, str] = {}
+SETTINGS_EVENT = threading.Event()
+DB_LOCAL = threading.local()
+DB_CONNS: list[sqlite3.Connection] = []
+DB_CONNS_LOCK = threading.Lock()
+
+# Both are written only while SCAN_LOCK is held; LAST_SCAN_AT is time.monotonic() of the last successful scan.
 SCAN_LOCK = threading.Lock()
 IS_SCANNING = False
-LAST_AUTO_SCAN_AT = 0.0
-TRENDS_CACHE: dict = {
-    "ts": 0.0,
-    "sig": "",
-    "data": {"generated_at": "", "items": []},
-}
-RELATED_CACHE: dict = {}
+LAST_SCAN_AT: Optional[float] = None
+CACHE_LOCK = threading.Lock()
+TRENDS_CACHE_MAX = 32
+TRENDS_CACHE: OrderedDict = OrderedDict()
+RELATED_CACHE_MAX = 256
+RELATED_CACHE_TTL = 300
+RELATED_CACHE: OrderedDict = OrderedDict()
+# Bumped on every write to the news table; /api/news bodies are cached per generation.
+NEWS_GEN = 0
+NEWS_ETAG_SEED = f"{time.time_ns():x}"
+NEWS_CACHE_MAX = 32
+NEWS_CACHE: OrderedDict = OrderedDict()
+# path -> (mtime_ns, etag, last_modified, raw bytes, gzipped bytes or None)
+STATIC_CACHE: dict[Path, tuple[int, str, str, bytes, Optional[bytes]]] = {}
+STATIC_CACHE_CONTROL = "public, max-age=300"
+COMPRESSIBLE_TYPES = ("text/", "application/javascript", "application/json", "image/svg+xml")
 DEFAULT_KEYWORDS = [
     "kimdir",
     "ne zaman",
@@ -59,16 +126,51 @@ def now_iso() -> str:
 
 
 def get_conn() -> sqlite3.Connection:
-    conn = sqlite3.connect(DB_PATH, check_same_thread=False)
+    # One long-lived connection per thread, so the page cache and statement cache survive across requests.
+    conn = getattr(DB_LOCAL, "conn", None)
+    if conn is not None:
+        return conn
+    # timeout doubles as SQLite's busy_timeout while a scan holds the write lock.
+    conn = sqlite3.connect(DB_PATH, check_same_thread=False, timeout=5)
     conn.row_factory = sqlite3.Row
+    # Per-connection settings; journal_mode=WAL itself is persisted in the db file by init_db.
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_size=-20000")
+    conn.execute("PRAGMA mmap_size=268435456")
+    DB_LOCAL.conn = conn
+    with DB_CONNS_LOCK:
+        DB_CONNS.append(conn)
     return conn
 
 
+@atexit.register
+def close_all_conns() -> None:
+    with DB_CONNS_LOCK:
+        for conn in DB_CONNS:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+        DB_CONNS.clear()
+
+
+def release_conn() -> None:
+    # Called after every request (not just every TCP connection, which keep-alive reuses):
+    # a failed statement must not leave the thread's connection holding the write lock.
+    conn = getattr(DB_LOCAL, "conn", None)
+    if conn is not None and conn.in_transaction:
+        conn.rollback()
+
+
 def init_db() -> None:
     conn = get_conn()
     cur = conn.cursor()
     cur.executescript(
         """
+        PRAGMA journal_mode=WAL;
+        PRAGMA wal_autocheckpoint=1000;
+
         CREATE TABLE IF NOT EXISTS keywords (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             keyword TEXT UNIQUE NOT NULL,
@@ -86,7 +188,9 @@ def init_db() -> None:
             trend_signal INTEGER NOT NULL DEFAULT 0,
             is_new INTEGER NOT NULL DEFAULT 1,
             saved INTEGER NOT NULL DEFAULT 0,
-            discovered_at TEXT NOT NULL
+            discovered_at TEXT NOT NULL,
+            published_ts INTEGER,
+            discovered_ts INTEGER
         );
 
         CREATE TABLE IF NOT EXISTS scans (
@@ -106,6 +210,38 @@ def init_db() -> None:
         """
     )
 
+    # Unix-second copies of the ISO columns: integer sort keys and smaller index entries.
+    # Databases created before these columns existed get them added and backfilled once.
+    columns = {row["name"] for row in cur.execute("PRAGMA table_info(news)")}
+    for column in ("published_ts", "discovered_ts"):
+        if column not in columns:
+            cur.execute(f"ALTER TABLE news ADD COLUMN {column} INTEGER")
+    cur.execute(
+        """
+        UPDATE news SET
+            published_ts = COALESCE(published_ts, CAST(strftime('%s', published_at) AS INTEGER)),
+            discovered_ts = COALESCE(discovered_ts, CAST(strftime('%s', discovered_at) AS INTEGER))
+        WHERE published_ts IS NULL OR discovered_ts IS NULL
+        """
+    )
+
+    cur.executescript(
+        """
+        -- Each /api/news view gets an index in its ORDER BY order; the partial ones also serve the counts.
+        CREATE INDEX IF NOT EXISTS idx_news_published_ts
+            ON news(published_ts DESC, trend_score DESC, discovered_ts DESC);
+        -- Per-keyword new/saved counts; the keyword-only count uses idx_news_keyword_published_ts.
+        CREATE INDEX IF NOT EXISTS idx_news_keyword_new ON news(keyword) WHERE is_new = 1;
+        CREATE INDEX IF NOT EXISTS idx_news_keyword_saved ON news(keyword) WHERE saved = 1;
+        CREATE INDEX IF NOT EXISTS idx_news_keyword_published_ts
+            ON news(keyword, published_ts DESC, trend_score DESC, discovered_ts DESC);
+        CREATE INDEX IF NOT EXISTS idx_news_new_published_ts
+            ON news(published_ts DESC, trend_score DESC, discovered_ts DESC) WHERE is_new = 1;
+        CREATE INDEX IF NOT EXISTS idx_news_saved_published_ts
+            ON news(published_ts DESC, trend_score DESC, discovered_ts DESC) WHERE saved = 1;
+        """
+    )
+
     defaults = {
         "auto_scan": "0",
         "interval_minutes": "10",
@@ -126,13 +262,20 @@ def init_db() -> None:
         )
 
     conn.commit()
-    conn.close()
+    load_settings()
+
+
+def load_settings() -> None:
+    rows = get_conn().execute("SELECT key, value FROM settings").fetchall()
+    SETTINGS_CACHE.update((row["key"], row["value"]) for row in rows)
 
 
 def get_setting(key: str, default: str = "") -> str:
+    # Settings only change through set_setting in this process, so the cache is authoritative.
+    if key in SETTINGS_CACHE:
+        return SETTINGS_CACHE[key]
     conn = get_conn()
     row = conn.execute("SELECT value FROM settings WHERE key = ?", (key,)).fetchone()
-    conn.close()
     return row["value"] if row else default
 
 
@@ -143,7 +286,8 @@ def set_setting(key: str, value: str) -> None:
         (key, value),
     )
     conn.commit()
-    conn.close()
+    SETTINGS_CACHE[key] = value
+    SETTINGS_EVENT.set()
 
 
 def parse_pub_date(text: Optional[str]) -> datetime:
@@ -158,28 +302,135 @@ def parse_pub_date(text: Optional[str]) -> datetime:
         return datetime.now(timezone.utc)
 
 
+@functools.lru_cache(maxsize=1024)
 def normalize_text(text: str) -> str:
-    return re.sub(r"\s+", " ", text or "").strip().lower()
+    return WS_RE.sub(" ", text or "").strip().lower()
+
+
+def checkout_http_conn(scheme: str, netloc: str) -> tuple[http.client.HTTPConnection, bool]:
+    with HTTP_POOL_LOCK:
+        idle = HTTP_POOL.get((scheme, netloc))
+        if idle:
+            return idle.pop(), True
+    if scheme == "https":
+        return http.client.HTTPSConnection(netloc, timeout=HTTP_TIMEOUT), False
+    return http.client.HTTPConnection(netloc, timeout=HTTP_TIMEOUT), False
+
+
+def checkin_http_conn(scheme: str, netloc: str, conn: http.client.HTTPConnection) -> None:
+    with HTTP_POOL_LOCK:
+        idle = HTTP_POOL.setdefault((scheme, netloc), [])
+        if len(idle) < HTTP_POOL_MAXSIZE:
+            idle.append(conn)
+            return
+    conn.close()
+
+
+def decode_body(body: bytes, encoding: str) -> bytes:
+    encoding = encoding.strip().lower()
+    if encoding == "gzip":
+        return gzip.decompress(body)
+    if encoding == "deflate":
+        try:
+            return zlib.decompress(body)
+        except zlib.error:
+            # Some servers send raw deflate without the zlib header.
+            return zlib.decompress(body, -zlib.MAX_WBITS)
+    return body
+
+
+def http_get(url: str) -> tuple[http.client.HTTPResponse, bytes]:
+    # Keep-alive GET over pooled connections; a stale pooled socket is retried once on a fresh one.
+    parts = urlsplit(url)
+    target = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+    while True:
+        conn, reused = checkout_http_conn(parts.scheme, parts.netloc)
+        try:
+            conn.request("GET", target, headers=HTTP_HEADERS)
+            resp = conn.getresponse()
+            body = resp.read()
+        except (http.client.HTTPException, OSError):
+            conn.close()
+            if reused:
+                continue
+            raise
+        if resp.will_close:
+            conn.close()
+        else:
+            checkin_http_conn(parts.scheme, parts.netloc, conn)
+        return resp, decode_body(body, resp.getheader("Content-Encoding", ""))
+
+
+def retry_delay(attempt: int, retry_after: Optional[str]) -> float:
+    # Exponential backoff with jitter; a server-sent Retry-After wins when longer, within the cap.
+    delay = HTTP_RETRY_BASE * (2 ** attempt)
+    if retry_after:
+        try:
+            delay = max(delay, float(retry_after))
+        except ValueError:
+            try:
+                delay = max(delay, (parse_pub_date(retry_after) - datetime.now(timezone.utc)).total_seconds())
+            except Exception:
+                pass
+    return min(HTTP_RETRY_CAP, delay) + random.random() * 0.25
 
 
 def fetch_xml(url: str) -> bytes:
-    req = Request(url, headers={"User-Agent": USER_AGENT})
-    with urlopen(req, timeout=12) as resp:
-        return resp.read()
+    attempt = 0
+    redirects = 0
+    while True:
+        resp, body = http_get(url)
+        location = resp.getheader("Location")
+        if resp.status in (301, 302, 303, 307, 308) and location:
+            redirects += 1
+            if redirects > 5:
+                raise HTTPError(url, resp.status, "Too many redirects", resp.headers, None)
+            url = urljoin(url, location)
+            continue
+        if resp.status in HTTP_RETRY_STATUSES and attempt < HTTP_RETRY_ATTEMPTS - 1:
+            time.sleep(retry_delay(attempt, resp.getheader("Retry-After")))
+            attempt += 1
+            continue
+        if resp.status >= 400:
+            raise HTTPError(url, resp.status, resp.reason, resp.headers, None)
+        return body
+
+
+def iter_rss_items(raw: bytes, max_items: int):
+    # Stream <item> fields and stop once max_items are read, so the feed tail is never parsed.
+    if max_items <= 0:
+        return
+    if HAS_LXML:
+        # lxml filters by tag in C, so only <item> end events reach Python.
+        events = ET.iterparse(io.BytesIO(raw), events=("end",), tag="item")
+    else:
+        events = ET.iterparse(io.BytesIO(raw), events=("end",))
+    count = 0
+    for _, elem in events:
+        if elem.tag != "item":
+            continue
+        # One pass over the children instead of a findtext() walk per field; first occurrence wins.
+        fields: dict = {}
+        for child in elem:
+            fields.setdefault(child.tag, child.text)
+        yield fields
+        elem.clear()
+        count += 1
+        if count >= max_items:
+            return
 
 
 def fetch_google_news(keyword: str, max_items: int = 30) -> list[dict]:
     query = quote_plus(f"{keyword} when:1d")
-    url = f"https://news.google.com/rss/search?q={query}&hl=tr&gl=TR&ceid=TR:tr"
+    url = GOOGLE_NEWS_RSS_URL.format(query=query)
     raw = fetch_xml(url)
-    root = ET.fromstring(raw)
 
     items: list[dict] = []
-    for item in root.findall("./channel/item")[:max_items]:
-        title = (item.findtext("title") or "").strip()
-        link = (item.findtext("link") or "").strip()
-        pub_date = parse_pub_date(item.findtext("pubDate")).isoformat()
-        source = (item.findtext("source") or "Google News").strip()
+    for item in iter_rss_items(raw, max_items):
+        title = (item.get("title") or "").strip()
+        link = (item.get("link") or "").strip()
+        pub_dt = parse_pub_date(item.get("pubDate"))
+        source = (item.get("source") or "Google News").strip()
 
         if not title or not link:
             continue
@@ -189,7 +440,8 @@ def fetch_google_news(keyword: str, max_items: int = 30) -> list[dict]:
                 "title": title,
                 "link": link,
                 "source": source,
-                "published_at": pub_date,
+                "published_at": pub_dt.isoformat(),
+                "published_ts": int(pub_dt.timestamp()),
                 "keyword": keyword,
             }
         )
@@ -197,12 +449,10 @@ def fetch_google_news(keyword: str, max_items: int = 30) -> list[dict]:
 
 
 def fetch_google_trends(max_items: int = 40) -> list[str]:
-    url = "https://trends.google.com/trending/rss?geo=TR"
-    raw = fetch_xml(url)
-    root = ET.fromstring(raw)
+    raw = fetch_xml(GOOGLE_TRENDS_RSS_URL)
     trends: list[str] = []
-    for item in root.findall("./channel/item")[:max_items]:
-        title = (item.findtext("title") or "").strip()
+    for item in iter_rss_items(raw, max_items):
+        title = (item.get("title") or "").strip()
         if title:
             trends.append(normalize_text(title))
     return trends
@@ -210,8 +460,7 @@ def fetch_google_trends(max_items: int = 40) -> list[str]:
 
 def parse_trends_json(raw: bytes) -> dict:
     text = raw.decode("utf-8", errors="ignore")
-    # Google Trends API prefix
-    text = re.sub(r"^\)\]\}',?\s*", "", text)
+    text = TRENDS_PREFIX_RE.sub("", text)
     return json.loads(text)
 
 
@@ -235,7 +484,7 @@ def fetch_last_hour_interest_for_batch(keywords: list[str], geo: str = "TR", tim
             "req": json.dumps(req_payload, ensure_ascii=False, separators=(",", ":")),
         }
     )
-    explore_url = f"https://trends.google.com/trends/api/explore?{params}"
+    explore_url = f"{TRENDS_API_URL}/explore?{params}"
     explore_raw = fetch_xml(explore_url)
     explore = parse_trends_json(explore_raw)
 
@@ -261,7 +510,7 @@ def fetch_last_hour_interest_for_batch(keywords: list[str], geo: str = "TR", tim
             "token": multi_token,
         }
     )
-    multi_url = f"https://trends.google.com/trends/api/widgetdata/multiline?{multi_params}"
+    multi_url = f"{TRENDS_API_URL}/widgetdata/multiline?{multi_params}"
     multi_raw = fetch_xml(multi_url)
     multi = parse_trends_json(multi_raw)
 
@@ -297,22 +546,21 @@ def trends_explore_widgets_for_keywords(
             "req": json.dumps(req_payload, ensure_ascii=False, separators=(",", ":")),
         }
     )
-    explore_url = f"https://trends.google.com/trends/api/explore?{params}"
+    explore_url = f"{TRENDS_API_URL}/explore?{params}"
     explore_raw = fetch_xml(explore_url)
     explore = parse_trends_json(explore_raw)
     return explore.get("widgets", [])
 
 
-def fetch_related_queries_for_keyword(
-    keyword: str, geo: str = "TR", timeframe: str = "now 1-H"
-) -> dict:
-    widgets = trends_explore_widgets_for_keywords([keyword], geo=geo, timeframe=timeframe)
-    related_widget = None
-    for w in widgets:
-        if w.get("id") == "RELATED_QUERIES":
-            related_widget = w
-            break
+def related_widget_keyword(widget: dict) -> str:
+    try:
+        restriction = widget["request"]["restriction"]["complexKeywordsRestriction"]
+        return restriction["keyword"][0]["value"]
+    except (KeyError, IndexError, TypeError):
+        return ""
 
+
+def fetch_related_queries_for_widget(keyword: str, related_widget: Optional[dict]) -> dict:
     if not related_widget:
         return {"keyword": keyword, "top": [], "rising": [], "generated_at": now_iso()}
 
@@ -329,7 +577,7 @@ def fetch_related_queries_for_keyword(
             "token": token,
         }
     )
-    url = f"https://trends.google.com/trends/api/widgetdata/relatedsearches?{params}"
+    url = f"{TRENDS_API_URL}/widgetdata/relatedsearches?{params}"
     raw = fetch_xml(url)
     data = parse_trends_json(raw)
 
@@ -361,17 +609,103 @@ def fetch_related_queries_for_keyword(
     }
 
 
-def cached_related_queries_for_keyword(
-    keyword: str, geo: str = "TR", timeframe: str = "now 1-H", ttl_seconds: int = 300, force_refresh: bool = False
+def fetch_related_queries_for_batch(
+    keywords: list[str], geo: str = "TR", timeframe: str = "now 1-H"
+) -> dict[str, dict]:
+    # One explore call covers the whole batch; Trends returns a RELATED_QUERIES widget per keyword.
+    widgets = trends_explore_widgets_for_keywords(keywords, geo=geo, timeframe=timeframe)
+    related = [w for w in widgets if w.get("id", "").startswith("RELATED_QUERIES")]
+    by_keyword = {normalize_text(related_widget_keyword(w)): w for w in related}
+
+    results: dict[str, dict] = {}
+    for idx, kw in enumerate(keywords):
+        widget = by_keyword.get(normalize_text(kw))
+        if widget is None and len(related) == len(keywords):
+            widget = related[idx]
+        # One keyword's failed relatedsearches call must not blank the rest of the batch.
+        try:
+            results[kw] = fetch_related_queries_for_widget(kw, widget)
+        except Exception as exc:
+            results[kw] = {"keyword": kw, "generated_at": now_iso(), "top": [], "rising": [], "error": str(exc)}
+    return results
+
+
+def fetch_related_queries_for_keyword(
+    keyword: str, geo: str = "TR", timeframe: str = "now 1-H"
 ) -> dict:
-    k = f"{normalize_text(keyword)}|{geo}|{timeframe}"
+    return fetch_related_queries_for_batch([keyword], geo=geo, timeframe=timeframe)[keyword]
+
+
+def cache_get(cache: OrderedDict, key: str) -> Optional[dict]:
+    with CACHE_LOCK:
+        item = cache.get(key)
+        if not item:
+            return None
+        if item["expires"] <= time.time():
+            del cache[key]
+            return None
+        cache.move_to_end(key)
+        return item["data"]
+
+
+def cache_put(cache: OrderedDict, key: str, data: dict, ttl_seconds: int, max_entries: int) -> None:
+    # Bounded LRU with per-entry expiry: expired entries are swept first, then the least recently used.
     now_ts = time.time()
-    item = RELATED_CACHE.get(k)
-    if not force_refresh and item and now_ts - item.get("ts", 0.0) < ttl_seconds:
-        return item.get("data", {})
+    with CACHE_LOCK:
+        cache[key] = {"expires": now_ts + ttl_seconds, "data": data}
+        cache.move_to_end(key)
+        for k in [k for k, v in cache.items() if v["expires"] <= now_ts]:
+            del cache[k]
+        while len(cache) > max_entries:
+            cache.popitem(last=False)
+
+
+def bump_news_gen() -> None:
+    global NEWS_GEN
+    with CACHE_LOCK:
+        NEWS_GEN += 1
+        NEWS_CACHE.clear()
+
+
+def news_cache_get(key: tuple) -> Optional[tuple[str, bytes]]:
+    with CACHE_LOCK:
+        item = NEWS_CACHE.get(key)
+        if item is not None:
+            NEWS_CACHE.move_to_end(key)
+        return item
+
+
+def news_cache_put(key: tuple, item: tuple[str, bytes]) -> None:
+    with CACHE_LOCK:
+        # A bump since the key was built means the body may predate the write; don't keep it.
+        if key[0] != NEWS_GEN:
+            return
+        NEWS_CACHE[key] = item
+        NEWS_CACHE.move_to_end(key)
+        while len(NEWS_CACHE) > NEWS_CACHE_MAX:
+            NEWS_CACHE.popitem(last=False)
+
+
+def related_cache_key(keyword: str, geo: str, timeframe: str) -> str:
+    return f"{normalize_text(keyword)}|{geo}|{timeframe}"
+
+
+def cache_related_queries(keyword: str, geo: str, timeframe: str, data: dict, ttl_seconds: int = RELATED_CACHE_TTL) -> None:
+    # Failed rows are returned to the caller but never cached, so the next request retries them.
+    if "error" not in data:
+        cache_put(RELATED_CACHE, related_cache_key(keyword, geo, timeframe), data, ttl_seconds, RELATED_CACHE_MAX)
+
+
+def cached_related_queries_for_keyword(
+    keyword: str, geo: str = "TR", timeframe: str = "now 1-H", ttl_seconds: int = RELATED_CACHE_TTL, force_refresh: bool = False
+) -> dict:
+    if not force_refresh:
+        data = cache_get(RELATED_CACHE, related_cache_key(keyword, geo, timeframe))
+        if data is not None:
+            return data
 
     data = fetch_related_queries_for_keyword(keyword=keyword, geo=geo, timeframe=timeframe)
-    RELATED_CACHE[k] = {"ts": now_ts, "data": data}
+    cache_related_queries(keyword, geo, timeframe, data, ttl_seconds)
     return data
 
 
@@ -385,31 +719,36 @@ def merge_related_rows(rows: list[dict], field: str) -> list[dict]:
     for rel in rows:
         source_kw = rel.get("keyword", "")
         items = rel.get(field, []) or []
-        for idx, item in enumerate(items):
+        for rank, item in enumerate(items, 1):
             q = (item.get("query") or "").strip()
             if not q:
                 continue
-            key = normalize_text(q)
+            key = WS_RE.sub(" ", q).lower()
             score = int(item.get("value", 0) or 0)
             formatted = item.get("formatted_value", "")
+            breakout = is_breakout_label(formatted)
             entry = merged.get(key)
-            if not entry:
-                entry = {
+            if entry is None:
+                merged[key] = {
                     "query": q,
                     "value": score,
                     "formatted_value": formatted,
-                    "from_keywords": [],
-                    "best_rank": idx + 1,
-                    "is_breakout": is_breakout_label(formatted),
+                    "from_keywords": [source_kw] if source_kw else [],
+                    "best_rank": rank,
+                    "is_breakout": breakout,
                 }
-                merged[key] = entry
-            entry["value"] = max(entry.get("value", 0), score)
-            entry["best_rank"] = min(entry.get("best_rank", idx + 1), idx + 1)
-            entry["is_breakout"] = entry.get("is_breakout", False) or is_breakout_label(formatted)
-            if formatted and not entry.get("formatted_value"):
+                continue
+            if score > entry["value"]:
+                entry["value"] = score
+            if rank < entry["best_rank"]:
+                entry["best_rank"] = rank
+            if breakout:
+                entry["is_breakout"] = True
+            if formatted and not entry["formatted_value"]:
                 entry["formatted_value"] = formatted
-            if source_kw and source_kw not in entry["from_keywords"]:
-                entry["from_keywords"].append(source_kw)
+            from_keywords = entry["from_keywords"]
+            if source_kw and source_kw not in from_keywords:
+                from_keywords.append(source_kw)
     return list(merged.values())
 
 
@@ -463,18 +802,30 @@ def build_discover_queries(
             "rising": paginate([], page, per_page),
         }
 
-    rows = []
+    found: dict[str, dict] = {}
+    missing: list[str] = []
     for kw in keywords:
+        cached = None if force_refresh else cache_get(RELATED_CACHE, related_cache_key(kw, "TR", timeframe))
+        if cached is None:
+            missing.append(kw)
+        else:
+            found[kw] = cached
+
+    def fetch_batch(batch: list[str]) -> dict[str, dict]:
         try:
-            rel = cached_related_queries_for_keyword(
-                keyword=kw,
-                geo="TR",
-                timeframe=timeframe,
-                force_refresh=force_refresh,
-            )
-            rows.append(rel)
+            fetched = fetch_related_queries_for_batch(batch, geo="TR", timeframe=timeframe)
         except Exception:
-            rows.append({"keyword": kw, "top": [], "rising": []})
+            return {kw: {"keyword": kw, "top": [], "rising": []} for kw in batch}
+        for kw, data in fetched.items():
+            cache_related_queries(kw, "TR", timeframe, data)
+        return fetched
+
+    batches = chunked(missing, 5)
+    if batches:
+        with ThreadPoolExecutor(max_workers=min(TRENDS_WORKERS, len(batches))) as ex:
+            for fetched in ex.map(fetch_batch, batches):
+                found.update(fetched)
+    rows = [found[kw] for kw in keywords]
 
     top_items = sort_discover_items(merge_related_rows(rows, "top"), "top")
     rising_items = sort_discover_items(merge_related_rows(rows, "rising"), "rising")
@@ -520,14 +871,17 @@ def build_last_hour_trends(keywords: list[str]) -> dict:
     if not keywords:
         return {"generated_at": now_iso(), "items": []}
 
-    collected: dict[str, list[int]] = {}
-    for batch in chunked(keywords, 8):
+    def fetch_batch(batch: list[str]) -> dict[str, list[int]]:
         try:
-            batch_vals = fetch_last_hour_interest_for_batch(batch, geo="TR", timeframe="now 1-H")
-            collected.update(batch_vals)
+            return fetch_last_hour_interest_for_batch(batch, geo="TR", timeframe="now 1-H")
         except Exception:
-            for kw in batch:
-                collected.setdefault(kw, [])
+            return {kw: [] for kw in batch}
+
+    batches = chunked(keywords, 8)
+    collected: dict[str, list[int]] = {}
+    with ThreadPoolExecutor(max_workers=min(TRENDS_WORKERS, len(batches))) as ex:
+        for batch_vals in ex.map(fetch_batch, batches):
+            collected.update(batch_vals)
 
     items = []
     for kw in keywords:
@@ -546,10 +900,12 @@ def build_last_hour_trends(keywords: list[str]) -> dict:
 
         latest = int(series[-1])
         avg_60 = sum(series) / len(series)
-        tail_20 = series[-20:] if len(series) >= 20 else series
-        head_20 = series[:20] if len(series) >= 20 else series
-        avg_20 = sum(tail_20) / len(tail_20)
-        prev_20 = sum(head_20) / len(head_20)
+        if len(series) > 20:
+            avg_20 = sum(series[-20:]) / 20
+            prev_20 = sum(series[:20]) / 20
+        else:
+            # Short series: both 20-point windows are the whole series.
+            avg_20 = prev_20 = avg_60
         delta_20 = avg_20 - prev_20
 
         item = {
@@ -568,25 +924,41 @@ def build_last_hour_trends(keywords: list[str]) -> dict:
 
 def cached_last_hour_trends(keywords: list[str], ttl_seconds: int = 240, force_refresh: bool = False) -> dict:
     sig = "|".join(sorted(normalize_text(k) for k in keywords))
-    now_ts = time.time()
-    if not force_refresh and TRENDS_CACHE["sig"] == sig and now_ts - TRENDS_CACHE["ts"] < ttl_seconds:
-        return TRENDS_CACHE["data"]
+    if not force_refresh:
+        data = cache_get(TRENDS_CACHE, sig)
+        if data is not None:
+            return data
 
     data = build_last_hour_trends(keywords)
-    TRENDS_CACHE["ts"] = now_ts
-    TRENDS_CACHE["sig"] = sig
-    TRENDS_CACHE["data"] = data
+    cache_put(TRENDS_CACHE, sig, data, ttl_seconds, TRENDS_CACHE_MAX)
     return data
 
 
-def calc_trend_score(title: str, keyword: str, published_at: str, trends: list[str], keyword_density: int) -> tuple[int, int]:
-    now = datetime.now(timezone.utc)
-    pub_dt = parse_pub_date(published_at)
-    age_hours = max(0.0, (now - pub_dt).total_seconds() / 3600.0)
-
-    title_norm = normalize_text(title)
-    keyword_norm = normalize_text(keyword)
-
+def prepare_trends(trends: list[str]) -> Optional[re.Pattern]:
+    # One alternation over every trend phrase and its long words, so each title is scanned once in C.
+    needles: set[str] = set()
+    for t in trends:
+        if not t:
+            continue
+        needles.add(t)
+        needles.update(part for part in t.split(" ") if len(part) > 4)
+    # A needle containing a shorter needle can never decide a match on its own, so drop it.
+    kept: list[str] = []
+    for n in sorted(needles, key=len):
+        if not any(k in n for k in kept):
+            kept.append(n)
+    if not kept:
+        return None
+    return re.compile("|".join(re.escape(n) for n in kept))
+
+
+def calc_trend_score(
+    title_norm: str,
+    keyword_norm: str,
+    age_hours: float,
+    trend_re: Optional[re.Pattern],
+    keyword_density: int,
+) -> tuple[int, int]:
     score = 0
     signal = 0
 
@@ -599,14 +971,7 @@ def calc_trend_score(title: str, keyword: str, published_at: str, trends: list[s
         score += 20
 
     # Trend match from Google Trends feed.
-    trend_hit = 0
-    for t in trends:
-        if not t:
-            continue
-        if t in title_norm or any(part for part in t.split(" ") if len(part) > 4 and part in title_norm):
-            trend_hit = 1
-            break
-    if trend_hit:
+    if trend_re is not None and trend_re.search(title_norm):
         score += 25
         signal = 1
 
@@ -618,12 +983,34 @@ def calc_trend_score(title: str, keyword: str, published_at: str, trends: list[s
     return score, signal
 
 
-def scan_now() -> dict:
-    global IS_SCANNING, LAST_AUTO_SCAN_AT
+def existing_news(conn: sqlite3.Connection, links: list[str], chunk_size: int = 500) -> dict[str, tuple]:
+    # link -> (trend_score, trend_signal, keyword, published_ts) for links already stored.
+    found: dict[str, tuple] = {}
+    unique = list(dict.fromkeys(links))
+    for i in range(0, len(unique), chunk_size):
+        part = unique[i:i + chunk_size]
+        placeholders = ",".join("?" * len(part))
+        rows = conn.execute(
+            "SELECT link, trend_score, trend_signal, keyword, published_ts "
+            f"FROM news WHERE link IN ({placeholders})",
+            part,
+        ).fetchall()
+        for row in rows:
+            found[row["link"]] = (row["trend_score"], row["trend_signal"], row["keyword"], row["published_ts"])
+    return found
+
+
+def scan_now(min_interval: float = 0.0) -> dict:
+    global IS_SCANNING, LAST_SCAN_AT
 
     if not SCAN_LOCK.acquire(blocking=False):
         return {"success": False, "error": "Tarama zaten devam ediyor."}
 
+    # The due check runs under the lock, so a scan that just finished elsewhere is never repeated.
+    if min_interval and LAST_SCAN_AT is not None and time.monotonic() - LAST_SCAN_AT < min_interval:
+        SCAN_LOCK.release()
+        return {"success": False, "skipped": True}
+
     IS_SCANNING = True
     scan_start = now_iso()
     conn = get_conn()
@@ -646,79 +1033,103 @@ def scan_now() -> dict:
             conn.commit()
             return {"success": False, "error": "Lutfen once anahtar kelime ekleyin."}
 
-        trends = []
-        try:
-            trends = fetch_google_trends()
-        except Exception:
-            # Trends endpoint fails sometimes; keep scan alive.
-            trends = []
-
         gathered: list[dict] = []
         keyword_density: dict[str, int] = {}
 
-        for kw in keywords:
+        def fetch_news(kw: str) -> list[dict]:
             try:
-                items = fetch_google_news(kw, max_items=25)
+                return fetch_google_news(kw, max_items=25)
             except Exception:
-                items = []
-            gathered.extend(items)
-            keyword_density[kw] = len(items)
+                return []
+
+        # Fetch concurrently but keep keyword order so later keywords still win on duplicate links.
+        # The Trends feed shares the pool so it overlaps with the news requests.
+        with ThreadPoolExecutor(max_workers=min(FETCH_WORKERS, len(keywords) + 1)) as ex:
+            trends_future = ex.submit(fetch_google_trends)
+            for kw, items in zip(keywords, ex.map(fetch_news, keywords)):
+                gathered.extend(items)
+                keyword_density[kw] = len(items)
+            try:
+                trends = trends_future.result()
+            except Exception:
+                # Trends endpoint fails sometimes; keep scan alive.
+                trends = []
 
-        new_articles = 0
         total_processed = 0
+        trend_re = prepare_trends(trends)
+        keyword_norms = {kw: normalize_text(kw) for kw in keywords}
+        now_ts = int(time.time())
+        discovered_at = now_iso()
+
+        # One write transaction for the whole ingest; the scan lock makes this the only news writer.
+        cur.execute("BEGIN IMMEDIATE")
+        known = existing_news(conn, [item["link"] for item in gathered])
+        rows: list[tuple] = []
+        new_articles = 0
 
         for item in gathered:
             total_processed += 1
             score, signal = calc_trend_score(
-                item["title"],
-                item["keyword"],
-                item["published_at"],
-                trends,
+                normalize_text(item["title"]),
+                keyword_norms[item["keyword"]],
+                max(0.0, (now_ts - item["published_ts"]) / 3600.0),
+                trend_re,
                 keyword_density.get(item["keyword"], 0),
             )
 
-            discovered_at = now_iso()
-            try:
-                cur.execute(
-                    """
-                    INSERT INTO news(title, link, source, published_at, keyword, trend_score, trend_signal, is_new, discovered_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, 1, ?)
-                    """,
-                    (
-                        item["title"],
-                        item["link"],
-                        item["source"],
-                        item["published_at"],
-                        item["keyword"],
-                        score,
-                        signal,
-                        discovered_at,
-                    ),
-                )
+            if item["link"] in known:
+                # Existing link: refresh score to current value and keep record updated,
+                # unless nothing the upsert would write has changed.
+                if known[item["link"]] == (score, signal, item["keyword"], item["published_ts"]):
+                    continue
+            else:
+                # Later duplicates of this link in the same scan always take the update branch.
+                known[item["link"]] = None
                 new_articles += 1
-            except sqlite3.IntegrityError:
-                # Existing link: refresh score to current value and keep record updated.
-                cur.execute(
-                    """
-                    UPDATE news
-                    SET trend_score = ?,
-                        trend_signal = ?,
-                        keyword = ?,
-                        source = COALESCE(source, ?),
-                        published_at = COALESCE(?, published_at)
-                    WHERE link = ?
-                    """,
-                    (score, signal, item["keyword"], item["source"], item["published_at"], item["link"]),
+
+            rows.append(
+                (
+                    item["title"],
+                    item["link"],
+                    item["source"],
+                    item["published_at"],
+                    item["published_ts"],
+                    item["keyword"],
+                    score,
+                    signal,
+                    discovered_at,
+                    now_ts,
                 )
+            )
+
+        cur.executemany(
+            """
+            INSERT INTO news(
+                title, link, source, published_at, published_ts, keyword,
+                trend_score, trend_signal, is_new, discovered_at, discovered_ts
+            )
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, 1, ?, ?)
+            ON CONFLICT(link) DO UPDATE SET
+                trend_score = excluded.trend_score,
+                trend_signal = excluded.trend_signal,
+                keyword = excluded.keyword,
+                source = COALESCE(news.source, excluded.source),
+                published_at = COALESCE(excluded.published_at, news.published_at),
+                published_ts = COALESCE(excluded.published_ts, news.published_ts)
+            """,
+            rows,
+        )
 
         cur.execute(
             "UPDATE scans SET finished_at=?, new_articles=?, total_articles=?, success=1 WHERE id=?",
             (now_iso(), new_articles, total_processed, scan_id),
         )
         conn.commit()
+        if rows:
+            bump_news_gen()
 
+        LAST_SCAN_AT = time.monotonic()
         set_setting("last_scan_time", now_iso())
-        LAST_AUTO_SCAN_AT = time.time()
 
         total_news = conn.execute("SELECT COUNT(*) AS c FROM news").fetchone()["c"]
 
@@ -729,6 +1140,7 @@ def scan_now() -> dict:
             "totalArticles": total_news,
         }
     except Exception as exc:
+        conn.rollback()
         cur.execute(
             "UPDATE scans SET finished_at=?, success=0, error=? WHERE id=?",
             (now_iso(), str(exc), scan_id),
@@ -736,50 +1148,115 @@ def scan_now() -> dict:
         conn.commit()
         return {"success": False, "error": f"Tarama hatasi: {exc}"}
     finally:
-        conn.close()
         IS_SCANNING = False
         SCAN_LOCK.release()
 
 
 def read_status() -> dict:
     conn = get_conn()
-    total_news = conn.execute("SELECT COUNT(*) AS c FROM news").fetchone()["c"]
-    new_count = conn.execute("SELECT COUNT(*) AS c FROM news WHERE is_new = 1").fetchone()["c"]
-    saved_count = conn.execute("SELECT COUNT(*) AS c FROM news WHERE saved = 1").fetchone()["c"]
-    keyword_count = conn.execute("SELECT COUNT(*) AS c FROM keywords").fetchone()["c"]
-    scan_count = conn.execute("SELECT COUNT(*) AS c FROM scans WHERE success = 1").fetchone()["c"]
+    counts = conn.execute(
+        """
+        SELECT (SELECT COUNT(*) FROM news) AS total_news,
+               (SELECT COUNT(*) FROM news WHERE is_new = 1) AS new_count,
+               (SELECT COUNT(*) FROM news WHERE saved = 1) AS saved_count,
+               (SELECT COUNT(*) FROM keywords) AS keyword_count,
+               (SELECT COUNT(*) FROM scans WHERE success = 1) AS scan_count
+        """
+    ).fetchone()
 
     status = {
-        "total_news": total_news,
-        "new_count": new_count,
-        "saved_count": saved_count,
-        "keyword_count": keyword_count,
-        "scan_count": scan_count,
+        "total_news": counts["total_news"],
+        "new_count": counts["new_count"],
+        "saved_count": counts["saved_count"],
+        "keyword_count": counts["keyword_count"],
+        "scan_count": counts["scan_count"],
         "last_scan_time": get_setting("last_scan_time", ""),
         "auto_scan": get_setting("auto_scan", "0") == "1",
         "interval_minutes": int(get_setting("interval_minutes", "10") or "10"),
         "is_scanning": IS_SCANNING,
     }
-    conn.close()
     return status
 
 
+def build_news_sqls() -> dict[tuple[str, bool], tuple[str, str]]:
+    # Every /api/news filter variant, built once so each request reuses the same SQL text.
+    sqls: dict[tuple[str, bool], tuple[str, str]] = {}
+    filters = {"all": None, "new": "is_new = 1", "saved": "saved = 1"}
+    for flt, cond in filters.items():
+        for has_keyword in (False, True):
+            where = [cond] if cond else []
+            if has_keyword:
+                where.append("keyword = ?")
+            where_sql = f"WHERE {' AND '.join(where)}" if where else ""
+            sql = (
+                "SELECT id, title, link, source, keyword, trend_score, trend_signal, "
+                "published_at, discovered_at, is_new, saved "
+                f"FROM news {where_sql} "
+                # Integer unix-second columns: native comparisons, and the idx_news_*published_ts indexes drive the sort.
+                "ORDER BY published_ts DESC, trend_score DESC, discovered_ts DESC LIMIT ?"
+            )
+            sqls[(flt, has_keyword)] = (sql, f"SELECT COUNT(*) AS c FROM news {where_sql}")
+    return sqls
+
+
+NEWS_SQLS = build_news_sqls()
+
+
+def read_request_body(handler: BaseHTTPRequestHandler) -> bytes:
+    # Read at most once per request; with keep-alive an unread body would be parsed as the next request.
+    body = getattr(handler, "request_body", None)
+    if body is None:
+        length = int(handler.headers.get("Content-Length", "0") or "0")
+        if length > MAX_REQUEST_BODY:
+            # Never buffer a client-sized allocation; drop the connection instead of draining it.
+            handler.close_connection = True
+            body = b""
+        else:
+            body = handler.rfile.read(max(0, length))
+        handler.request_body = body
+    return body
+
+
 def parse_json_body(handler: BaseHTTPRequestHandler) -> dict:
-    length = int(handler.headers.get("Content-Length", "0") or "0")
-    if length <= 0:
+    body = read_request_body(handler)
+    if not body:
         return {}
-    body = handler.rfile.read(length)
     try:
         return json.loads(body.decode("utf-8"))
     except Exception:
         return {}
 
 
+def dumps_json(payload: Union[dict, list]) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
 def json_response(handler: BaseHTTPRequestHandler, payload: Union[dict, list], status: int = 200) -> None:
-    data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    data = dumps_json(payload)
     handler.send_response(status)
     handler.send_header("Content-Type", "application/json; charset=utf-8")
     handler.send_header("Content-Length", str(len(data)))
+    if handler.close_connection:
+        handler.send_header("Connection", "close")
+    handler.end_headers()
+    handler.wfile.write(data)
+
+
+def cached_json_response(handler: BaseHTTPRequestHandler, etag: str, data: bytes) -> None:
+    # no-cache makes browsers revalidate every poll, which is a 304 until the news generation moves.
+    if etag in handler.headers.get("If-None-Match", ""):
+        handler.send_response(HTTPStatus.NOT_MODIFIED)
+        handler.send_header("ETag", etag)
+        handler.send_header("Cache-Control", "no-cache")
+        handler.end_headers()
+        return
+    handler.send_response(200)
+    handler.send_header("Content-Type", "application/json; charset=utf-8")
+    handler.send_header("Content-Length", str(len(data)))
+    handler.send_header("ETag", etag)
+    handler.send_header("Cache-Control", "no-cache")
     handler.end_headers()
     handler.wfile.write(data)
 
@@ -789,7 +1266,57 @@ def read_file(path: Path) -> bytes:
         return f.read()
 
 
+def load_static(path: Path, content_type: str) -> Optional[tuple[str, str, bytes, Optional[bytes]]]:
+    # A warm asset costs one stat(); files are re-read and re-gzipped only when their mtime changes.
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    if not stat.S_ISREG(st.st_mode):
+        return None
+    cached = STATIC_CACHE.get(path)
+    if cached and cached[0] == st.st_mtime_ns:
+        return cached[1:]
+    raw = read_file(path)
+    gz = gzip.compress(raw, compresslevel=6) if content_type.startswith(COMPRESSIBLE_TYPES) else None
+    if gz is not None and len(gz) >= len(raw):
+        gz = None
+    etag = f'"{st.st_mtime_ns:x}-{len(raw):x}"'
+    last_modified = formatdate(st.st_mtime, usegmt=True)
+    STATIC_CACHE[path] = (st.st_mtime_ns, etag, last_modified, raw, gz)
+    return etag, last_modified, raw, gz
+
+
+def not_modified(handler: BaseHTTPRequestHandler, etag: str, last_modified: str) -> bool:
+    # If-None-Match wins when present; If-Modified-Since is only a fallback (RFC 9110).
+    if_none_match = handler.headers.get("If-None-Match")
+    if if_none_match is not None:
+        return etag in if_none_match or if_none_match.strip() == "*"
+    if_modified_since = handler.headers.get("If-Modified-Since")
+    if not if_modified_since:
+        return False
+    try:
+        return parsedate_to_datetime(last_modified) <= parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+
+
 class AppHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1 keeps dashboard polling on one TCP connection; every response sets Content-Length.
+    protocol_version = "HTTP/1.1"
+    # Idle keep-alive sockets give their pool worker back after this many seconds.
+    timeout = KEEPALIVE_TIMEOUT
+    disable_nagle_algorithm = True
+    # Buffered socket files: header lines come from one recv, and headers + body leave in one send.
+    rbufsize = 65536
+    wbufsize = 65536
+
+    def handle_one_request(self) -> None:
+        try:
+            super().handle_one_request()
+        finally:
+            release_conn()
+
     def do_GET(self) -> None:
         parsed = urlparse(self.path)
         path = parsed.path
@@ -829,7 +1356,10 @@ class AppHandler(BaseHTTPRequestHandler):
         if not path.startswith("/api/"):
             self.send_error(HTTPStatus.NOT_FOUND, "Not Found")
             return
-        self.handle_api_post(path)
+        if not self.accept_request_body():
+            return
+        self.handle_api_post(path, parsed)
+        self.discard_request_body()
 
     def do_DELETE(self) -> None:
         parsed = urlparse(self.path)
@@ -837,290 +1367,370 @@ class AppHandler(BaseHTTPRequestHandler):
         if not path.startswith("/api/"):
             self.send_error(HTTPStatus.NOT_FOUND, "Not Found")
             return
-        self.handle_api_delete(path)
+        if not self.accept_request_body():
+            return
+        self.handle_api_delete(path, parsed)
+        self.discard_request_body()
+
+    def accept_request_body(self) -> bool:
+        # Size is checked before any handler runs, so no worker reads or blocks on a client-chosen length.
+        self.request_body = None
+        try:
+            self.body_length = int(self.headers.get("Content-Length", "0") or "0")
+        except ValueError:
+            self.body_length = -1
+        if self.body_length < 0:
+            self.close_connection = True
+            json_response(self, {"error": "gecersiz Content-Length"}, 400)
+            return False
+        if self.body_length > MAX_REQUEST_BODY:
+            self.close_connection = True
+            json_response(self, {"error": "istek govdesi cok buyuk"}, 413)
+            return False
+        return True
+
+    def discard_request_body(self) -> None:
+        # Endpoints that ignore their body leave it unread; closing is cheaper than draining it.
+        if self.request_body is None and self.body_length > 0:
+            self.close_connection = True
 
     def serve_file(self, file_path: Path, content_type: str) -> None:
-        if not file_path.exists() or not file_path.is_file():
+        static = load_static(file_path, content_type)
+        if static is None:
             self.send_error(HTTPStatus.NOT_FOUND, "Not Found")
             return
-        payload = read_file(file_path)
+        etag, last_modified, raw, gz = static
+        use_gzip = gz is not None and "gzip" in self.headers.get("Accept-Encoding", "")
+        if use_gzip:
+            etag = etag[:-1] + '-gz"'
+        if not_modified(self, etag, last_modified):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", STATIC_CACHE_CONTROL)
+            self.end_headers()
+            return
+        payload = gz if use_gzip else raw
         self.send_response(200)
         self.send_header("Content-Type", content_type)
         self.send_header("Content-Length", str(len(payload)))
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", last_modified)
+        self.send_header("Cache-Control", STATIC_CACHE_CONTROL)
+        if gz is not None:
+            self.send_header("Vary", "Accept-Encoding")
+        if use_gzip:
+            self.send_header("Content-Encoding", "gzip")
         self.end_headers()
         self.wfile.write(payload)
 
     def handle_api_get(self, path: str, parsed) -> None:
-        if path == "/api/status":
-            json_response(self, read_status())
-            return
-
-        if path == "/api/keywords":
-            conn = get_conn()
-            rows = conn.execute(
-                """
-                SELECT k.id, k.keyword,
-                       (SELECT COUNT(*) FROM news n WHERE n.keyword = k.keyword) AS count
-                FROM keywords k
-                ORDER BY k.created_at DESC
-                """
-            ).fetchall()
-            conn.close()
-            json_response(self, {"keywords": [dict(r) for r in rows]})
-            return
-
-        if path == "/api/trends/last-hour":
-            query = parse_qs(parsed.query)
-            force_refresh = (query.get("force", ["0"])[0] or "0") == "1"
-            conn = get_conn()
-            rows = conn.execute(
-                "SELECT keyword FROM keywords ORDER BY created_at DESC"
-            ).fetchall()
-            conn.close()
-            keywords = [r["keyword"] for r in rows]
-            data = cached_last_hour_trends(keywords, force_refresh=force_refresh)
-            json_response(self, data)
-            return
+        self.dispatch(self.GET_ROUTES, self.GET_PARAM_ROUTES, path, parsed)
 
-        if path == "/api/trends/related":
-            query = parse_qs(parsed.query)
-            keyword = (query.get("keyword", [""])[0] or "").strip()
-            force_refresh = (query.get("force", ["0"])[0] or "0") == "1"
+    def handle_api_post(self, path: str, parsed) -> None:
+        self.dispatch(self.POST_ROUTES, self.POST_PARAM_ROUTES, path, parsed)
 
-            if not keyword:
-                conn = get_conn()
-                row = conn.execute(
-                    "SELECT keyword FROM keywords ORDER BY created_at DESC LIMIT 1"
-                ).fetchone()
-                conn.close()
-                keyword = row["keyword"] if row else ""
+    def handle_api_delete(self, path: str, parsed) -> None:
+        self.dispatch(self.DELETE_ROUTES, self.DELETE_PARAM_ROUTES, path, parsed)
 
-            if not keyword:
-                json_response(self, {"keyword": "", "generated_at": now_iso(), "top": [], "rising": []})
+    def dispatch(self, routes: dict, param_routes: list, path: str, parsed) -> None:
+        # Exact paths are one dict lookup; parametric routes are tried in order only on a miss.
+        route = routes.get(path)
+        if route is not None:
+            route(self, parsed)
+            return
+        for pattern, param_route in param_routes:
+            match = pattern.match(path)
+            if match:
+                param_route(self, match.group(1))
                 return
+        self.send_error(HTTPStatus.NOT_FOUND, "Not Found")
 
-            try:
-                data = cached_related_queries_for_keyword(
-                    keyword=keyword,
-                    geo="TR",
-                    timeframe="now 1-H",
-                    force_refresh=force_refresh,
-                )
-                json_response(self, data)
-            except Exception as exc:
-                json_response(
-                    self,
-                    {
-                        "keyword": keyword,
-                        "generated_at": now_iso(),
-                        "top": [],
-                        "rising": [],
-                        "error": str(exc),
-                    },
-                    200,
-                )
-            return
+    def api_status(self, parsed) -> None:
+        json_response(self, read_status())
+
+    def api_keywords(self, parsed) -> None:
+        conn = get_conn()
+        rows = conn.execute(
+            """
+            SELECT k.id, k.keyword, COUNT(n.keyword) AS count
+            FROM keywords k
+            LEFT JOIN news n ON n.keyword = k.keyword
+            GROUP BY k.id
+            ORDER BY k.created_at DESC
+            """
+        ).fetchall()
+        json_response(self, {"keywords": [dict(r) for r in rows]})
 
-        if path == "/api/discover":
-            query = parse_qs(parsed.query)
-            timeframe_key = (query.get("timeframe", ["1h"])[0] or "1h").strip().lower()
-            force_refresh = (query.get("force", ["0"])[0] or "0") == "1"
-            selected_keyword = (query.get("keyword", [""])[0] or "").strip()
-            page = int((query.get("page", ["1"])[0] or "1"))
-            per_page = int((query.get("per_page", ["25"])[0] or "25"))
-            per_page = 50 if per_page >= 50 else 25
+    def api_trends_last_hour(self, parsed) -> None:
+        query = parse_qs(parsed.query)
+        force_refresh = (query.get("force", ["0"])[0] or "0") == "1"
+        conn = get_conn()
+        rows = conn.execute(
+            "SELECT keyword FROM keywords ORDER BY created_at DESC"
+        ).fetchall()
+        keywords = [r["keyword"] for r in rows]
+        data = cached_last_hour_trends(keywords, force_refresh=force_refresh)
+        json_response(self, data)
 
-            timeframe = "now 4-H" if timeframe_key == "4h" else "now 1-H"
+    def api_trends_related(self, parsed) -> None:
+        query = parse_qs(parsed.query)
+        keyword = (query.get("keyword", [""])[0] or "").strip()
+        force_refresh = (query.get("force", ["0"])[0] or "0") == "1"
 
-            if selected_keyword:
-                keywords = [selected_keyword]
-            else:
-                conn = get_conn()
-                rows = conn.execute(
-                    "SELECT keyword FROM keywords ORDER BY created_at DESC LIMIT 30"
-                ).fetchall()
-                conn.close()
-                keywords = [r["keyword"] for r in rows]
+        if not keyword:
+            conn = get_conn()
+            row = conn.execute(
+                "SELECT keyword FROM keywords ORDER BY created_at DESC LIMIT 1"
+            ).fetchone()
+            keyword = row["keyword"] if row else ""
+
+        if not keyword:
+            json_response(self, {"keyword": "", "generated_at": now_iso(), "top": [], "rising": []})
+            return
 
-            data = build_discover_with_fallback(
-                keywords=keywords,
-                timeframe=timeframe,
+        try:
+            data = cached_related_queries_for_keyword(
+                keyword=keyword,
+                geo="TR",
+                timeframe="now 1-H",
                 force_refresh=force_refresh,
-                page=page,
-                per_page=per_page,
             )
             json_response(self, data)
-            return
-
-        if path == "/api/news":
-            query = parse_qs(parsed.query)
-            flt = (query.get("filter", ["all"])[0] or "all").lower()
-            keyword = (query.get("keyword", [""])[0] or "").strip()
-            limit = int((query.get("limit", ["120"])[0] or "120"))
-            limit = max(1, min(limit, 500))
-
-            where = []
-            args: list = []
-
-            if flt == "new":
-                where.append("is_new = 1")
-            elif flt == "saved":
-                where.append("saved = 1")
-
-            if keyword:
-                where.append("keyword = ?")
-                args.append(keyword)
-
-            where_sql = f"WHERE {' AND '.join(where)}" if where else ""
-            sql = (
-                "SELECT id, title, link, source, keyword, trend_score, trend_signal, "
-                "published_at, discovered_at, is_new, saved "
-                f"FROM news {where_sql} "
-                "ORDER BY datetime(published_at) DESC, trend_score DESC, datetime(discovered_at) DESC LIMIT ?"
+        except Exception as exc:
+            json_response(
+                self,
+                {
+                    "keyword": keyword,
+                    "generated_at": now_iso(),
+                    "top": [],
+                    "rising": [],
+                    "error": str(exc),
+                },
+                200,
             )
-            args.append(limit)
 
-            conn = get_conn()
-            rows = conn.execute(sql, tuple(args)).fetchall()
+    def api_discover(self, parsed) -> None:
+        query = parse_qs(parsed.query)
+        timeframe_key = (query.get("timeframe", ["1h"])[0] or "1h").strip().lower()
+        force_refresh = (query.get("force", ["0"])[0] or "0") == "1"
+        selected_keyword = (query.get("keyword", [""])[0] or "").strip()
+        page = int((query.get("page", ["1"])[0] or "1"))
+        per_page = int((query.get("per_page", ["25"])[0] or "25"))
+        per_page = 50 if per_page >= 50 else 25
 
-            total_sql = f"SELECT COUNT(*) AS c FROM news {where_sql}"
-            total = conn.execute(total_sql, tuple(args[:-1])).fetchone()["c"]
+        timeframe = "now 4-H" if timeframe_key == "4h" else "now 1-H"
 
-            conn.close()
-            json_response(self, {"total": total, "news": [dict(r) for r in rows]})
-            return
-
-        if path == "/api/scans":
+        if selected_keyword:
+            keywords = [selected_keyword]
+        else:
             conn = get_conn()
             rows = conn.execute(
-                "SELECT id, started_at, finished_at, new_articles, total_articles, success, error "
-                "FROM scans ORDER BY id DESC LIMIT 30"
+                "SELECT keyword FROM keywords ORDER BY created_at DESC LIMIT 30"
             ).fetchall()
-            conn.close()
-            json_response(self, {"scans": [dict(r) for r in rows]})
-            return
-
-        self.send_error(HTTPStatus.NOT_FOUND, "Not Found")
-
-    def handle_api_post(self, path: str) -> None:
-        if path == "/api/scan":
-            result = scan_now()
-            code = 200 if result.get("success") else 409
-            json_response(self, result, code)
-            return
-
-        if path == "/api/keywords":
-            data = parse_json_body(self)
-            keyword = (data.get("keyword") or "").strip()
-            if not keyword:
-                json_response(self, {"error": "keyword gerekli"}, 400)
-                return
+            keywords = [r["keyword"] for r in rows]
 
-            conn = get_conn()
-            try:
-                conn.execute(
-                    "INSERT INTO keywords(keyword, created_at) VALUES (?, ?)",
-                    (keyword, now_iso()),
-                )
-                conn.commit()
-                json_response(self, {"success": True})
-            except sqlite3.IntegrityError:
-                json_response(self, {"error": "Bu kelime zaten var"}, 409)
-            finally:
-                conn.close()
+        data = build_discover_with_fallback(
+            keywords=keywords,
+            timeframe=timeframe,
+            force_refresh=force_refresh,
+            page=page,
+            per_page=per_page,
+        )
+        json_response(self, data)
+
+    def api_news(self, parsed) -> None:
+        query = parse_qs(parsed.query)
+        flt = (query.get("filter", ["all"])[0] or "all").lower()
+        keyword = (query.get("keyword", [""])[0] or "").strip()
+        limit = int((query.get("limit", ["120"])[0] or "120"))
+        limit = max(1, min(limit, 500))
+
+        if (flt, bool(keyword)) not in NEWS_SQLS:
+            flt = "all"
+        # Read the generation before querying so a concurrent write can only make the entry stale-keyed, never stale.
+        cache_key = (NEWS_GEN, flt, keyword, limit)
+        cached = news_cache_get(cache_key)
+        if cached is not None:
+            cached_json_response(self, *cached)
             return
 
-        if path.startswith("/api/save/"):
-            article_id = path.replace("/api/save/", "", 1).strip()
-            if not article_id.isdigit():
-                json_response(self, {"error": "gecersiz id"}, 400)
-                return
-
-            conn = get_conn()
-            row = conn.execute("SELECT saved FROM news WHERE id = ?", (article_id,)).fetchone()
-            if not row:
-                conn.close()
-                json_response(self, {"error": "kayit bulunamadi"}, 404)
-                return
-
-            new_saved = 0 if row["saved"] == 1 else 1
-            conn.execute("UPDATE news SET saved = ? WHERE id = ?", (new_saved, article_id))
-            conn.commit()
-            conn.close()
-            json_response(self, {"success": True, "saved": bool(new_saved)})
+        sql, total_sql = NEWS_SQLS[(flt, bool(keyword))]
+        args: list = [keyword] if keyword else []
+
+        conn = get_conn()
+        rows = conn.execute(sql, (*args, limit)).fetchall()
+        if len(rows) < limit:
+            # Short page: the LIMIT did not cut anything, so the row count is the total.
+            total = len(rows)
+        else:
+            total = conn.execute(total_sql, tuple(args)).fetchone()["c"]
+
+        data = dumps_json({"total": total, "news": [dict(r) for r in rows]})
+        etag = f'W/"{NEWS_ETAG_SEED}-{cache_key[0]}-{zlib.crc32(repr(cache_key[1:]).encode("utf-8")):x}"'
+        news_cache_put(cache_key, (etag, data))
+        cached_json_response(self, etag, data)
+
+    def api_scans(self, parsed) -> None:
+        conn = get_conn()
+        rows = conn.execute(
+            "SELECT id, started_at, finished_at, new_articles, total_articles, success, error "
+            "FROM scans ORDER BY id DESC LIMIT 30"
+        ).fetchall()
+        json_response(self, {"scans": [dict(r) for r in rows]})
+
+    def api_scan(self, parsed) -> None:
+        result = scan_now()
+        code = 200 if result.get("success") else 409
+        json_response(self, result, code)
+
+    def api_add_keyword(self, parsed) -> None:
+        data = parse_json_body(self)
+        keyword = (data.get("keyword") or "").strip()
+        if not keyword:
+            json_response(self, {"error": "keyword gerekli"}, 400)
             return
 
-        if path == "/api/mark-seen":
-            conn = get_conn()
-            conn.execute("UPDATE news SET is_new = 0 WHERE is_new = 1")
+        conn = get_conn()
+        try:
+            conn.execute(
+                "INSERT INTO keywords(keyword, created_at) VALUES (?, ?)",
+                (keyword, now_iso()),
+            )
             conn.commit()
-            conn.close()
             json_response(self, {"success": True})
-            return
+        except sqlite3.IntegrityError:
+            conn.rollback()
+            json_response(self, {"error": "Bu kelime zaten var"}, 409)
 
-        if path == "/api/settings":
-            data = parse_json_body(self)
-            auto_scan = data.get("auto_scan")
-            interval = data.get("interval_minutes")
+    def api_mark_seen(self, parsed) -> None:
+        conn = get_conn()
+        cur = conn.execute("UPDATE news SET is_new = 0 WHERE is_new = 1")
+        conn.commit()
+        if cur.rowcount:
+            bump_news_gen()
+        json_response(self, {"success": True})
 
-            if auto_scan is not None:
-                set_setting("auto_scan", "1" if bool(auto_scan) else "0")
+    def api_settings(self, parsed) -> None:
+        data = parse_json_body(self)
+        auto_scan = data.get("auto_scan")
+        interval = data.get("interval_minutes")
 
-            if interval is not None:
-                try:
-                    interval_val = int(interval)
-                except Exception:
-                    json_response(self, {"error": "interval_minutes sayi olmali"}, 400)
-                    return
-                interval_val = max(2, min(interval_val, 180))
-                set_setting("interval_minutes", str(interval_val))
+        if auto_scan is not None:
+            set_setting("auto_scan", "1" if bool(auto_scan) else "0")
 
-            json_response(self, {"success": True})
+        if interval is not None:
+            try:
+                interval_val = int(interval)
+            except Exception:
+                json_response(self, {"error": "interval_minutes sayi olmali"}, 400)
+                return
+            interval_val = max(2, min(interval_val, 180))
+            set_setting("interval_minutes", str(interval_val))
+
+        json_response(self, {"success": True})
+
+    def api_toggle_save(self, arg: str) -> None:
+        article_id = arg.strip()
+        if not article_id.isdigit():
+            json_response(self, {"error": "gecersiz id"}, 400)
             return
 
-        self.send_error(HTTPStatus.NOT_FOUND, "Not Found")
+        conn = get_conn()
+        # Single atomic toggle; RETURNING needs SQLite >= 3.35.
+        row = conn.execute(
+            "UPDATE news SET saved = 1 - saved WHERE id = ? RETURNING saved", (article_id,)
+        ).fetchone()
+        conn.commit()
+        if not row:
+            json_response(self, {"error": "kayit bulunamadi"}, 404)
+            return
 
-    def handle_api_delete(self, path: str) -> None:
-        if path.startswith("/api/keywords/"):
-            keyword = path.replace("/api/keywords/", "", 1).strip()
-            keyword = unquote(keyword)
-            if not keyword:
-                json_response(self, {"error": "keyword gerekli"}, 400)
-                return
+        bump_news_gen()
+        json_response(self, {"success": True, "saved": bool(row["saved"])})
 
-            conn = get_conn()
-            cur = conn.cursor()
-            cur.execute("DELETE FROM keywords WHERE keyword = ?", (keyword,))
-            deleted = cur.rowcount
-            conn.commit()
-            conn.close()
-            json_response(self, {"success": True, "deleted": deleted})
+    def api_delete_keyword(self, arg: str) -> None:
+        keyword = arg.strip()
+        keyword = unquote(keyword)
+        if not keyword:
+            json_response(self, {"error": "keyword gerekli"}, 400)
             return
 
-        self.send_error(HTTPStatus.NOT_FOUND, "Not Found")
+        conn = get_conn()
+        cur = conn.cursor()
+        cur.execute("DELETE FROM keywords WHERE keyword = ?", (keyword,))
+        deleted = cur.rowcount
+        conn.commit()
+        json_response(self, {"success": True, "deleted": deleted})
+
+    GET_ROUTES = {
+        "/api/status": api_status,
+        "/api/keywords": api_keywords,
+        "/api/trends/last-hour": api_trends_last_hour,
+        "/api/trends/related": api_trends_related,
+        "/api/discover": api_discover,
+        "/api/news": api_news,
+        "/api/scans": api_scans,
+    }
+    GET_PARAM_ROUTES: list = []
+    POST_ROUTES = {
+        "/api/scan": api_scan,
+        "/api/keywords": api_add_keyword,
+        "/api/mark-seen": api_mark_seen,
+        "/api/settings": api_settings,
+    }
+    POST_PARAM_ROUTES = [(re.compile(r"^/api/save/(.*)$"), api_toggle_save)]
+    DELETE_ROUTES: dict = {}
+    DELETE_PARAM_ROUTES = [(re.compile(r"^/api/keywords/(.*)$"), api_delete_keyword)]
 
     def log_message(self, fmt: str, *args) -> None:
         # Keep output concise.
         return
 
 
+class PooledHTTPServer(ThreadingHTTPServer):
+    # Requests run on a fixed pool of long-lived threads instead of one new thread per connection.
+    request_queue_size = 64
+
+    def __init__(self, server_address, handler_class, workers: int = HTTP_WORKERS):
+        super().__init__(server_address, handler_class)
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="http")
+
+    def process_request(self, request, client_address) -> None:
+        self.executor.submit(self.process_request_thread, request, client_address)
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
 def auto_scan_worker() -> None:
-    global LAST_AUTO_SCAN_AT
+    last_checkpoint = time.monotonic()
 
     while True:
+        # Cleared before reading settings so a change made meanwhile still cuts the wait short.
+        SETTINGS_EVENT.clear()
         try:
+            if time.monotonic() - last_checkpoint >= WAL_CHECKPOINT_INTERVAL:
+                # Bound WAL growth off the request path instead of leaving it to a random COMMIT.
+                last_checkpoint = time.monotonic()
+                get_conn().execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            timeout = WAL_CHECKPOINT_INTERVAL - (time.monotonic() - last_checkpoint)
+
             auto_on = get_setting("auto_scan", "0") == "1"
             interval = int(get_setting("interval_minutes", "10") or "10")
             interval = max(2, min(interval, 180))
 
             if auto_on:
-                now = time.time()
-                elapsed = now - LAST_AUTO_SCAN_AT
-                if LAST_AUTO_SCAN_AT == 0.0 or elapsed >= interval * 60:
-                    scan_now()
-            time.sleep(8)
+                # A no-op unless due; a busy lock means a scan is already running, so just wait.
+                scan_now(min_interval=interval * 60)
+                last_scan_at = LAST_SCAN_AT
+                due_in = 0.0 if last_scan_at is None else interval * 60 - (time.monotonic() - last_scan_at)
+                timeout = min(timeout, due_in)
+
+            # The floor keeps a failing scan from being retried in a tight loop.
+            SETTINGS_EVENT.wait(max(AUTO_SCAN_MIN_WAIT, timeout))
         except Exception:
-            time.sleep(8)
+            time.sleep(AUTO_SCAN_MIN_WAIT)
 
 
 def main() -> None:
@@ -1129,7 +1739,7 @@ def main() -> None:
     thread = threading.Thread(target=auto_scan_worker, daemon=True)
     thread.start()
 
-    server = ThreadingHTTPServer((HOST, PORT), AppHandler)
+    server = PooledHTTPServer((HOST, PORT), AppHandler)
     print(f"Trend Hunter Pro calisiyor: http://{HOST}:{PORT}")
     try:
         server.serve_forever()